@@ -1,14 +1,15 @@
 """Paso del pipeline que calcula variaciones quincenales de rendimiento SEO y escribe los resultados en Google Sheets.
 
 Este módulo requiere un archivo hermano llamado ``sheets_manager.py`` que exponga una clase ``SheetsManager``
-con al menos la siguiente interfaz mínima:
+que cumpla el protocolo ``SheetsIO`` definido aquí:
 
     manager = SheetsManager(spreadsheet_name="SEO_Master_Data")
-    df = manager.read_worksheet("gsc_data_daily")  # devuelve un pandas.DataFrame
+    frames = manager.read_worksheets(["gsc_data_daily", "ga4_data_daily"])  # dict de pandas.DataFrame
+    blocks = manager.read_ranges(["'gsc_data_daily'!1:1", "'gsc_data_daily'!A2:A"])  # celdas por rango A1
     manager.write_dataframe("analysis_raw", dataframe, replace=True)
 
-Si tu manager ofrece nombres de método distintos, ajusta las funciones auxiliares
-``fetch_dataframe`` y ``push_dataframe`` para que utilicen tu API.
+Si usas otro backend con nombres de método distintos, envuélvelo en un adaptador que implemente
+``SheetsIO`` y pásalo como ``manager`` a ``run_pipeline``.
 
 Para ejecutar el pipeline en un scheduler, por ejemplo semanal, usa una entrada cron como:
 
@@ -20,21 +21,28 @@ o un workflow de GitHub Actions con un disparador ``schedule`` y cron ``0 3 * *
 from __future__ import annotations
 
 import argparse
+import os
+import re
 from datetime import datetime, timedelta
-from typing import Callable, Dict, List, Optional, Tuple
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 
-from sheets_manager import SheetsManager
+from _agg_numba import group_sum_mean
+from sheets_manager import SheetsManager, column_letter, values_to_dataframe
 
 GOOGLE_SHEET_NAME = "SEO_Master_Data"
 GSC_WORKSHEET = "gsc_data_daily"
 GA4_WORKSHEET = "ga4_data_daily"
 OUTPUT_WORKSHEET = "analysis_raw"
 SUMMARY_COLUMN = "Resumen_IA"
+# Formatos de fecha aceptados en las pestañas de origen; ante un empate gana el primero (día antes que mes).
+SHEET_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%Y/%m/%d", "%d-%m-%Y")
 MIN_BASELINE = 1.0
 MAX_VARIATION_ABS = 1000.0
+LOOKBACK_DAYS = 28  # ventana reciente + ventana previa de 14 días cada una
 
 # Bloque de configuración ----------------------------------------------------
 
@@ -144,60 +152,173 @@ OUTPUT_COLUMNS = [
 # Funciones auxiliares -------------------------------------------------------
 
 
-def fetch_dataframe(manager: SheetsManager, worksheet: str) -> pd.DataFrame:
-    """Obtiene una pestaña como pandas DataFrame usando la API disponible del manager."""
+class SheetsIO(Protocol):
+    """Interfaz mínima de lectura/escritura que el pipeline necesita del manager de Google Sheets.
 
-    if hasattr(manager, "read_worksheet"):
-        return manager.read_worksheet(worksheet)
-    if hasattr(manager, "get_worksheet_df"):
-        return manager.get_worksheet_df(worksheet)
-    if hasattr(manager, "to_dataframe"):
-        return manager.to_dataframe(worksheet)
-    raise AttributeError(
-        "SheetsManager no expone un método de lectura compatible. "
-        "Implementa 'read_worksheet', 'get_worksheet_df' o 'to_dataframe'."
-    )
+    ``read_worksheets`` devuelve pestañas completas por título y ``read_ranges`` las celdas (lista de
+    filas) de cada rango A1 pedido, en el mismo orden. ``SheetsManager`` la cumple; otros backends
+    deben implementarla directamente o envolverse en un adaptador explícito.
+    """
+
+    def read_worksheets(self, worksheet_titles: Sequence[str]) -> Dict[str, pd.DataFrame]:
+        ...
+
+    def read_ranges(self, a1_ranges: Sequence[str]) -> List[List[List[Any]]]:
+        ...
+
+    def write_dataframe(self, worksheet_title: str, dataframe: pd.DataFrame, replace: bool = True) -> None:
+        ...
+
+
+def infer_date_format(values: pd.Series) -> str:
+    """Elige el formato de ``SHEET_DATE_FORMATS`` que reconoce más celdas no vacías de ``values``.
+
+    Se evalúa sobre los valores únicos de toda la serie, así que el resultado no depende del orden de
+    las filas; una columna ambigua (todos los días <= 12) se interpreta con el día primero.
+    """
+
+    texts = values.dropna().astype(str).str.strip()
+    unique = pd.Series(texts[texts != ""].unique())
+    best_format, best_count = SHEET_DATE_FORMATS[0], -1
+    for date_format in SHEET_DATE_FORMATS:
+        count = int(pd.to_datetime(unique, format=date_format, errors="coerce").notna().sum())
+        if count == len(unique):
+            return date_format
+        if count > best_count:
+            best_format, best_count = date_format, count
+    return best_format
+
+
+def parse_dates(values: pd.Series, date_format: Optional[str] = None) -> pd.Series:
+    """Convierte fechas exportadas por GSC/GA4 con un único formato para toda la serie.
 
+    Sin ``date_format`` se usa ``infer_date_format(values)``; las celdas que no encajan con el formato
+    quedan como ``NaT``.
+    """
 
-def push_dataframe(manager: SheetsManager, worksheet: str, df: pd.DataFrame) -> None:
-    """Escribe un pandas DataFrame en Google Sheets, reemplazando el contenido previo."""
-
-    if hasattr(manager, "write_dataframe"):
-        manager.write_dataframe(worksheet, df, replace=True)
-        return
-    if hasattr(manager, "update_worksheet"):
-        manager.update_worksheet(worksheet, df, replace=True)
-        return
-    if hasattr(manager, "write_df"):
-        manager.write_df(worksheet, df, replace=True)
-        return
-    raise AttributeError(
-        "SheetsManager no expone un método de escritura compatible. "
-        "Implementa 'write_dataframe', 'update_worksheet' o 'write_df'."
+    date_format = date_format or infer_date_format(values)
+    return pd.to_datetime(values, format=date_format, errors="coerce", cache=True)
+
+
+def read_worksheets_from_date(
+    manager: SheetsIO,
+    worksheets: Sequence[str],
+    select: Callable[[pd.Series], pd.Series],
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+    """Lee cada pestaña desde la primera fila cuya fecha cumple ``select`` hasta el final.
+
+    Usa tres llamadas ``read_ranges`` para todas las pestañas: encabezados, columna de fecha y rango
+    de filas a partir de la primera seleccionada. Si ninguna fila cumple ``select`` se devuelve sólo
+    el encabezado; sin columna de fecha reconocible o sin fechas válidas la pestaña se lee completa.
+    Devuelve también, por pestaña, el formato de fecha inferido de la columna completa, que debe
+    pasarse a ``normalize_dataframe`` para interpretar el subconjunto leído igual que la ventana.
+    """
+
+    titles = list(worksheets)
+    header_blocks = manager.read_ranges([f"'{title}'!1:1" for title in titles])
+    headers = {title: block[0] if block else [] for title, block in zip(titles, header_blocks)}
+
+    date_letters: Dict[str, str] = {}
+    for title, header in headers.items():
+        lowered_header = [str(name).lower() for name in header]
+        for candidate in DATE_COLUMN_CANDIDATES:
+            if candidate.lower() in lowered_header:
+                date_letters[title] = column_letter(lowered_header.index(candidate.lower()) + 1)
+                break
+
+    dated_titles = list(date_letters)
+    date_blocks = manager.read_ranges(
+        [f"'{title}'!{date_letters[title]}2:{date_letters[title]}" for title in dated_titles]
     )
 
+    # ``None`` indica que ninguna fila cumple el criterio y basta con el encabezado.
+    row_ranges: Dict[str, Optional[str]] = {}
+    date_formats: Dict[str, str] = {}
+    for title, block in zip(dated_titles, date_blocks):
+        column = pd.Series([row[0] if row else "" for row in block])
+        date_formats[title] = infer_date_format(column)
+        dates = parse_dates(column, date_formats[title])
+        if dates.isna().all():
+            continue
+        selected = np.flatnonzero(select(dates).to_numpy())
+        if not len(selected):
+            row_ranges[title] = None
+            continue
+        first_row = int(selected[0]) + 2
+        row_ranges[title] = f"'{title}'!{first_row}:{len(dates) + 1}"
+
+    fetch_ranges = {title: row_ranges.get(title, f"'{title}'") for title in titles}
+    fetch_titles = [title for title, a1_range in fetch_ranges.items() if a1_range is not None]
+    blocks = dict(zip(fetch_titles, manager.read_ranges([fetch_ranges[title] for title in fetch_titles])))
+    frames: Dict[str, pd.DataFrame] = {}
+    for title in titles:
+        values = blocks.get(title, [])
+        if title in row_ranges:
+            values = [headers[title]] + values
+        frames[title] = values_to_dataframe(values)
+    return frames, date_formats
+
+
+def read_source_worksheets(
+    manager: SheetsIO,
+    worksheets: List[str],
+    lookback_days: Optional[int] = None,
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+    """Lee las pestañas de origen; con ``lookback_days`` sólo descarga las filas de esos últimos días.
+
+    Devuelve las pestañas y los formatos de fecha conocidos por pestaña (vacío si se leyeron completas).
+    """
+
+    if lookback_days is None:
+        return manager.read_worksheets(worksheets), {}
+    return read_worksheets_from_date(
+        manager,
+        worksheets,
+        lambda dates: dates >= dates.max() - pd.Timedelta(days=lookback_days - 1),
+    )
 
-def locate_column(df: pd.DataFrame, candidates: Tuple[str, ...], kind: str) -> str:
-    """Devuelve la primera columna que coincide con los candidatos (sin sensibilidad a mayúsculas)."""
 
-    lowered = {col.lower(): col for col in df.columns}
-    for candidate in candidates:
-        if candidate.lower() in lowered:
-            return lowered[candidate.lower()]
-    raise KeyError(f"No se encontró una columna de tipo {kind}. Revisado: {candidates}")
+def locate_columns(df: pd.DataFrame, needed: Dict[str, Tuple[str, ...]]) -> Dict[str, str]:
+    """Resuelve, por cada tipo pedido, la primera columna que coincide con sus candidatos.
 
+    La comparación no distingue mayúsculas; el mapa de nombres en minúscula se construye una sola vez.
+    """
 
-def normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
-    """Estandariza nombres de columnas y convierte fechas."""
+    lowered = {col.lower(): col for col in df.columns}
+    resolved = {}
+    for kind, candidates in needed.items():
+        match = next((lowered[name.lower()] for name in candidates if name.lower() in lowered), None)
+        if match is None:
+            raise KeyError(f"No se encontró una columna de tipo {kind}. Revisado: {candidates}")
+        resolved[kind] = match
+    return resolved
 
-    df = df.copy()
-    date_col = locate_column(df, DATE_COLUMN_CANDIDATES, "date")
-    url_col = locate_column(df, URL_COLUMN_CANDIDATES, "URL")
 
-    df.rename(columns={date_col: "date", url_col: "url"}, inplace=True)
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    df = df.dropna(subset=["date", "url"]).reset_index(drop=True)
-    df["url"] = df["url"].astype(str)
+def normalize_dataframe(
+    df: pd.DataFrame,
+    metric_columns: Iterable[str] = (),
+    date_format: Optional[str] = None,
+) -> pd.DataFrame:
+    """Estandariza nombres de columnas, convierte fechas y métricas, y ordena las filas cronológicamente.
+
+    ``date_format`` fija el formato de fecha; si se omite se infiere de las filas recibidas.
+    """
+
+    columns = locate_columns(df, {"date": DATE_COLUMN_CANDIDATES, "url": URL_COLUMN_CANDIDATES})
+
+    # El DataFrame recibido nunca se modifica: cada paso devuelve uno nuevo.
+    df = df.rename(columns={columns["date"]: "date", columns["url"]: "url"})
+    df = df.assign(date=parse_dates(df["date"], date_format))
+    df = df.dropna(subset=["date", "url"])
+    # Ordenar por fecha permite que ``aggregate_periods`` recorte cada ventana con búsqueda binaria.
+    df = df.sort_values("date", kind="stable").reset_index(drop=True)
+    # Las URLs se repiten a diario: como categoría ocupan menos memoria y se factorizan por código.
+    df["url"] = df["url"].astype(str).astype("category")
+    # Fuerza las columnas métricas a float32 una sola vez: evita fallos por strings y la precisión
+    # sobra para conteos, tasas y posiciones, con la mitad de memoria que float64.
+    for column in metric_columns:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype(np.float32)
     return df
 
 
@@ -212,33 +333,67 @@ def compute_period_bounds(reference_date: datetime) -> Tuple[datetime, datetime,
     return recent_start, recent_end, previous_start, previous_end
 
 
-def aggregate_period(
+def aggregate_periods(
     df: pd.DataFrame,
     metric_config: Dict[str, Dict[str, str]],
-    start: datetime,
-    end: datetime,
-) -> pd.DataFrame:
-    """Agrega las métricas del periodo usando la función configurada para cada métrica."""
-
-    mask = (df["date"] >= start) & (df["date"] <= end)
-    period_df = df.loc[mask].copy()
-    group = period_df.groupby("url", dropna=False)
-
-    data = {}
-    for metric_name, config in metric_config.items():
-        column = config["column"]
-        if column not in period_df.columns:
-            continue
-        # Fuerza las columnas métricas a ser numéricas para evitar fallos por strings.
-        if not pd.api.types.is_numeric_dtype(period_df[column]):
-            period_df[column] = pd.to_numeric(period_df[column], errors="coerce")
-        agg_func = config.get("agg", "sum")
-        data[metric_name] = group[column].agg(agg_func)
-
-    if not data:
-        return pd.DataFrame(columns=metric_config.keys())
+    recent_start: datetime,
+    recent_end: datetime,
+    previous_start: datetime,
+    previous_end: datetime,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Agrega las métricas de los periodos reciente y previo en una sola pasada.
+
+    Espera el DataFrame ordenado por fecha y con métricas numéricas (ver ``normalize_dataframe``)
+    para ubicar ambas ventanas con ``searchsorted``. Cada fila recibe el código
+    ``url * 2 + periodo`` y las agregaciones ``sum``/``mean`` se resuelven con el kernel de
+    ``_agg_numba``; otras funciones usan pandas.
+    """
+
+    dates = df["date"].to_numpy()
+    previous_lower = dates.searchsorted(pd.Timestamp(previous_start).to_datetime64(), side="left")
+    previous_upper = dates.searchsorted(pd.Timestamp(previous_end).to_datetime64(), side="right")
+    recent_lower = dates.searchsorted(pd.Timestamp(recent_start).to_datetime64(), side="left")
+    recent_upper = dates.searchsorted(pd.Timestamp(recent_end).to_datetime64(), side="right")
+
+    positions = np.arange(previous_lower, max(previous_lower, recent_upper))
+    # 0 = periodo reciente, 1 = periodo previo, -1 = fuera de ambas ventanas.
+    period_codes = np.where(positions >= recent_lower, 0, np.where(positions < previous_upper, 1, -1))
+    period_df = df.iloc[previous_lower : previous_lower + len(positions)]
+    in_window = period_codes >= 0
+    if not in_window.all():
+        period_df = period_df.iloc[in_window]
+        period_codes = period_codes[in_window]
+
+    columns = {
+        metric_name: config["column"]
+        for metric_name, config in metric_config.items()
+        if config["column"] in period_df.columns
+    }
+    if not columns:
+        empty = pd.DataFrame(columns=metric_config.keys())
+        return empty, empty.copy()
+
+    url_codes, urls = pd.factorize(period_df["url"])
+    group_codes = url_codes * 2 + period_codes
+    ngroups = len(urls) * 2
+
+    recent: Dict[str, np.ndarray] = {}
+    previous: Dict[str, np.ndarray] = {}
+    for metric_name, column in columns.items():
+        values = period_df[column].to_numpy()
+        agg_func = metric_config[metric_name].get("agg", "sum")
+        if agg_func in ("sum", "mean"):
+            aggregated = group_sum_mean(group_codes, values, ngroups, agg_func == "mean")
+        else:
+            aggregated = (
+                pd.Series(values).groupby(group_codes).agg(agg_func).reindex(range(ngroups)).to_numpy()
+            )
+        aggregated = aggregated.reshape(len(urls), 2)
+        recent[metric_name] = aggregated[:, 0]
+        previous[metric_name] = aggregated[:, 1]
 
-    return pd.DataFrame(data)
+    index = pd.Index(np.asarray(urls, dtype=object), name="url")
+    return pd.DataFrame(recent, index=index), pd.DataFrame(previous, index=index)
 
 
 def percentage_change(
@@ -250,15 +405,20 @@ def percentage_change(
 ) -> pd.Series:
     """Calcula la variación porcentual evitando resultados extremos cuando la base es muy pequeña."""
 
-    aligned_current, aligned_previous = current.align(previous, join="outer")
-    denominator = aligned_previous.replace({0: np.nan})
-    denominator = denominator.where(denominator.abs() >= min_baseline)
-    variation = (aligned_current - aligned_previous) / denominator * 100
-    variation = variation.replace([np.inf, -np.inf], np.nan)
-    variation = variation.where(~denominator.isna())
+    joined = pd.concat([current.rename("current"), previous.rename("previous")], axis=1)
+    current_values = joined["current"].to_numpy(dtype=np.float32)
+    previous_values = joined["previous"].to_numpy(dtype=np.float32)
+    valid = (np.abs(previous_values) >= min_baseline) & (previous_values != 0)
+    # Una sola expresión enmascarada: el divisor 1.0 en bases inválidas evita divisiones por cero
+    # sin pasadas extra de ``replace``/``where`` sobre el resultado.
+    variation = np.where(
+        valid,
+        (current_values - previous_values) / np.where(valid, previous_values, 1.0) * 100.0,
+        np.nan,
+    )
     if max_abs_variation is not None:
-        variation = variation.where(variation.abs() <= max_abs_variation)
-    return variation
+        variation[np.abs(variation) > max_abs_variation] = np.nan
+    return pd.Series(variation, index=joined.index)
 
 
 def difference_change(
@@ -271,71 +431,81 @@ def difference_change(
 ) -> pd.Series:
     """Calcula la diferencia directa entre periodos, opcionalmente escalada."""
 
-    aligned_current, aligned_previous = current.align(previous, join="outer")
-    baseline = aligned_previous.abs().combine(aligned_current.abs(), func=max)
-    baseline = baseline.where(baseline >= min_baseline)
-    diff = (aligned_current - aligned_previous) * multiplier
-    diff = diff.where(~baseline.isna())
+    joined = pd.concat([current.rename("current"), previous.rename("previous")], axis=1)
+    current_values = joined["current"].to_numpy(dtype=np.float32)
+    previous_values = joined["previous"].to_numpy(dtype=np.float32)
+    baseline = np.maximum(np.abs(current_values), np.abs(previous_values))
+    diff = (current_values - previous_values) * multiplier
+    diff[~(baseline >= min_baseline)] = np.nan
     if max_abs_difference is not None:
-        diff = diff.where(diff.abs() <= max_abs_difference)
-    return diff
+        diff[np.abs(diff) > max_abs_difference] = np.nan
+    return pd.Series(diff, index=joined.index)
 
 
-def build_variation_table(
-    gsc_df: pd.DataFrame,
-    ga4_df: pd.DataFrame,
-    reference_date: datetime,
-) -> pd.DataFrame:
-    """Genera el DataFrame final con las variaciones porcentuales para todas las métricas."""
-
-    recent_start, recent_end, previous_start, previous_end = compute_period_bounds(reference_date)
+MetricPlanEntry = Tuple[str, bool, str, Callable[[pd.Series, pd.Series], pd.Series], Optional[int]]
 
-    gsc_recent = aggregate_period(gsc_df, GSC_METRICS, recent_start, recent_end)
-    gsc_previous = aggregate_period(gsc_df, GSC_METRICS, previous_start, previous_end)
 
-    ga4_recent = aggregate_period(ga4_df, GA4_METRICS, recent_start, recent_end)
-    ga4_previous = aggregate_period(ga4_df, GA4_METRICS, previous_start, previous_end)
+def build_metric_plan() -> List[MetricPlanEntry]:
+    """Resuelve una sola vez, para cada métrica de ``METRIC_SEQUENCE``, su fuente, etiqueta y cálculo.
 
-    urls = pd.Index([]).union(gsc_recent.index).union(gsc_previous.index)
-    urls = urls.union(ga4_recent.index).union(ga4_previous.index)
-
-    result = pd.DataFrame({"URL": urls})
-    result.set_index("URL", inplace=True)
+    Cada entrada es ``(métrica, es_gsc, etiqueta, cambio, decimales)``, donde ``cambio`` ya lleva
+    fijados los umbrales configurados y sólo recibe las series reciente y previa.
+    """
 
+    plan = []
     for metric_key, source in METRIC_SEQUENCE:
         config = source[metric_key]
-        column_name = config["label"]
-        if source is GSC_METRICS:
-            current_series = gsc_recent.get(metric_key, pd.Series(dtype=float))
-            previous_series = gsc_previous.get(metric_key, pd.Series(dtype=float))
-        else:
-            current_series = ga4_recent.get(metric_key, pd.Series(dtype=float))
-            previous_series = ga4_previous.get(metric_key, pd.Series(dtype=float))
-
-        change_mode = config.get("change", "percentage")
         min_baseline = config.get("min_baseline", MIN_BASELINE)
-
-        if change_mode == "difference":
-            multiplier = config.get("multiplier", 1.0)
-            max_abs_difference = config.get("max_abs_difference")
-            result[column_name] = difference_change(
-                current_series,
-                previous_series,
+        if config.get("change", "percentage") == "difference":
+            change = partial(
+                difference_change,
                 min_baseline=min_baseline,
-                multiplier=multiplier,
-                max_abs_difference=max_abs_difference,
+                multiplier=config.get("multiplier", 1.0),
+                max_abs_difference=config.get("max_abs_difference"),
             )
         else:
-            max_abs_variation = config.get("max_abs_variation", MAX_VARIATION_ABS)
-            result[column_name] = percentage_change(
-                current_series,
-                previous_series,
+            change = partial(
+                percentage_change,
                 min_baseline=min_baseline,
-                max_abs_variation=max_abs_variation,
+                max_abs_variation=config.get("max_abs_variation", MAX_VARIATION_ABS),
             )
-        decimals = config.get("decimals")
+        plan.append((metric_key, source is GSC_METRICS, config["label"], change, config.get("decimals")))
+    return plan
+
+
+METRIC_PLAN = build_metric_plan()
+
+
+def build_variation_table(
+    gsc_df: pd.DataFrame,
+    ga4_df: pd.DataFrame,
+    reference_date: datetime,
+) -> pd.DataFrame:
+    """Genera el DataFrame final con las variaciones porcentuales para todas las métricas."""
+
+    recent_start, recent_end, previous_start, previous_end = compute_period_bounds(reference_date)
+
+    bounds = (recent_start, recent_end, previous_start, previous_end)
+    gsc_recent, gsc_previous = aggregate_periods(gsc_df, GSC_METRICS, *bounds)
+    ga4_recent, ga4_previous = aggregate_periods(ga4_df, GA4_METRICS, *bounds)
+
+    # Unión ordenada de las URLs de los cuatro periodos agregados.
+    frames = (gsc_recent, gsc_previous, ga4_recent, ga4_previous)
+    all_urls = np.concatenate([frame.index.to_numpy(dtype=object) for frame in frames])
+    urls = pd.Index(np.unique(all_urls), name="URL")
+
+    result = pd.DataFrame(index=urls)
+
+    for metric_key, from_gsc, column_name, change, decimals in METRIC_PLAN:
+        recent, previous = (gsc_recent, gsc_previous) if from_gsc else (ga4_recent, ga4_previous)
+        values = change(
+            recent.get(metric_key, pd.Series(dtype=float)),
+            previous.get(metric_key, pd.Series(dtype=float)),
+        )
         if decimals is not None:
-            result[column_name] = result[column_name].round(decimals)
+            # Se redondea en float64 para que la salida no arrastre artefactos de float32 (0.8899999...).
+            values = values.astype(np.float64).round(decimals)
+        result[column_name] = values
 
     recent_label = f"{recent_start:%Y-%m-%d} a {recent_end:%Y-%m-%d}"
     previous_label = f"{previous_start:%Y-%m-%d} a {previous_end:%Y-%m-%d}"
@@ -349,6 +519,45 @@ def build_variation_table(
     return result
 
 
+def load_cached_dataframe(
+    manager: SheetsIO,
+    worksheet: str,
+    metric_columns: List[str],
+    cache_path: str,
+    lookback_days: Optional[int] = None,
+) -> pd.DataFrame:
+    """Devuelve la pestaña normalizada combinando la caché parquet local con las filas nuevas.
+
+    Con caché previa sólo se descargan las filas desde la última fecha cacheada (que se relee por si
+    quedó incompleta); sin ella se lee como siempre. El resultado, recortado a ``lookback_days``
+    si se indica, se vuelve a guardar en ``cache_path``. Requiere ``pyarrow``.
+    """
+
+    cached = pd.read_parquet(cache_path, engine="pyarrow") if os.path.isfile(cache_path) else None
+    if cached is None or cached.empty:
+        frames, date_formats = read_source_worksheets(manager, [worksheet], lookback_days)
+        df = normalize_dataframe(frames[worksheet], metric_columns, date_formats.get(worksheet))
+    else:
+        since = cached["date"].max()
+        frames, date_formats = read_worksheets_from_date(manager, [worksheet], lambda dates: dates >= since)
+        fresh = normalize_dataframe(frames[worksheet], metric_columns, date_formats.get(worksheet))
+        # La lectura devuelve todo lo posterior a la primera fila >= ``since``; las filas
+        # más antiguas ubicadas después en la hoja ya están en la caché y se descartan.
+        fresh = fresh[fresh["date"] >= since]
+        df = pd.concat([cached[cached["date"] < since], fresh], ignore_index=True)
+        df = df.sort_values("date", kind="stable").reset_index(drop=True)
+        # Las categorías de ambos bloques difieren; tras concatenar se vuelve a categorizar.
+        df["url"] = df["url"].astype(str).astype("category")
+
+    if lookback_days is not None and not df.empty:
+        cutoff = df["date"].max() - pd.Timedelta(days=lookback_days - 1)
+        df = df[df["date"] >= cutoff].reset_index(drop=True)
+
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    df.to_parquet(cache_path, engine="pyarrow", index=False)
+    return df
+
+
 def determine_reference_date(gsc_df: pd.DataFrame, ga4_df: pd.DataFrame) -> datetime:
     """Selecciona la fecha más reciente disponible entre ambos datasets."""
 
@@ -365,8 +574,10 @@ def determine_reference_date(gsc_df: pd.DataFrame, ga4_df: pd.DataFrame) -> date
 def run_pipeline(
     spreadsheet_name: str = GOOGLE_SHEET_NAME,
     *,
-    manager: Optional[SheetsManager] = None,
+    manager: Optional[SheetsIO] = None,
     write_output: bool = True,
+    full_history: bool = False,
+    cache_dir: Optional[str] = None,
     verbose: bool = False,
 ) -> pd.DataFrame:
     """Ejecuta el flujo leer -> calcular -> escribir opcional y devuelve el DataFrame resultado."""
@@ -377,23 +588,51 @@ def run_pipeline(
     manager = manager or SheetsManager(spreadsheet_name=spreadsheet_name)
 
     if verbose:
-        print(f"Cliente listo; leyendo pestaña {GSC_WORKSHEET}", flush=True)
-
-    gsc_df_raw = fetch_dataframe(manager, GSC_WORKSHEET)
-    ga4_df_raw = fetch_dataframe(manager, GA4_WORKSHEET)
-
-    if verbose:
-        print(
-            f"GSC filas: {len(gsc_df_raw)} | columnas: {list(gsc_df_raw.columns)}",
-            flush=True,
+        print(f"Cliente listo; leyendo pestañas {GSC_WORKSHEET} y {GA4_WORKSHEET}", flush=True)
+
+    lookback_days = None if full_history else LOOKBACK_DAYS
+    gsc_metric_columns = [config["column"] for config in GSC_METRICS.values()]
+    ga4_metric_columns = [config["column"] for config in GA4_METRICS.values()]
+
+    if cache_dir:
+        # El modo de lectura forma parte de la clave: una caché recortada a la ventana no sirve
+        # para una corrida con ``full_history`` (ni al revés).
+        cache_mode = "full" if full_history else f"{LOOKBACK_DAYS}d"
+        cache_name = re.sub(r"[^\w.-]", "_", spreadsheet_name)
+        cache_prefix = os.path.join(os.path.expanduser(cache_dir), f"{cache_name}__{cache_mode}")
+        gsc_df = load_cached_dataframe(
+            manager,
+            GSC_WORKSHEET,
+            gsc_metric_columns,
+            f"{cache_prefix}__{GSC_WORKSHEET}.parquet",
+            lookback_days,
         )
-        print(
-            f"GA4 filas: {len(ga4_df_raw)} | columnas: {list(ga4_df_raw.columns)}",
-            flush=True,
+        ga4_df = load_cached_dataframe(
+            manager,
+            GA4_WORKSHEET,
+            ga4_metric_columns,
+            f"{cache_prefix}__{GA4_WORKSHEET}.parquet",
+            lookback_days,
         )
+        if verbose:
+            print(f"GSC filas (con caché): {len(gsc_df)} | GA4 filas (con caché): {len(ga4_df)}", flush=True)
+    else:
+        raw_frames, date_formats = read_source_worksheets(manager, [GSC_WORKSHEET, GA4_WORKSHEET], lookback_days)
+        gsc_df_raw = raw_frames[GSC_WORKSHEET]
+        ga4_df_raw = raw_frames[GA4_WORKSHEET]
 
-    gsc_df = normalize_dataframe(gsc_df_raw)
-    ga4_df = normalize_dataframe(ga4_df_raw)
+        if verbose:
+            print(
+                f"GSC filas: {len(gsc_df_raw)} | columnas: {list(gsc_df_raw.columns)}",
+                flush=True,
+            )
+            print(
+                f"GA4 filas: {len(ga4_df_raw)} | columnas: {list(ga4_df_raw.columns)}",
+                flush=True,
+            )
+
+        gsc_df = normalize_dataframe(gsc_df_raw, gsc_metric_columns, date_formats.get(GSC_WORKSHEET))
+        ga4_df = normalize_dataframe(ga4_df_raw, ga4_metric_columns, date_formats.get(GA4_WORKSHEET))
 
     reference_date = determine_reference_date(gsc_df, ga4_df)
     variation_df = build_variation_table(gsc_df, ga4_df, reference_date)
@@ -412,7 +651,7 @@ def run_pipeline(
     if write_output:
         if verbose:
             print(f"Escribiendo resultados en la pestaña {OUTPUT_WORKSHEET}", flush=True)
-        push_dataframe(manager, OUTPUT_WORKSHEET, variation_df)
+        manager.write_dataframe(OUTPUT_WORKSHEET, variation_df, replace=True)
 
     if verbose:
         print("Pipeline completado", flush=True)
@@ -431,6 +670,16 @@ def main(args: Optional[List[str]] = None) -> None:
         action="store_true",
         help="Calcula las variaciones sin escribir en Google Sheets (imprime el CSV en stdout).",
     )
+    parser.add_argument(
+        "--full-history",
+        action="store_true",
+        help=f"Lee las pestañas completas en lugar de sólo los últimos {LOOKBACK_DAYS} días.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directorio donde cachear en parquet las pestañas normalizadas entre corridas (requiere pyarrow).",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -442,6 +691,8 @@ def main(args: Optional[List[str]] = None) -> None:
     variation_df = run_pipeline(
         spreadsheet_name=parsed.spreadsheet_name,
         write_output=not parsed.dry_run,
+        full_history=parsed.full_history,
+        cache_dir=parsed.cache_dir,
         verbose=parsed.verbose,
     )
 
@@ -8,11 +8,13 @@ como lo hace por defecto la libreria oficial de Google.
 from __future__ import annotations
 
 import os
-from typing import Any, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 import gspread
+import numpy as np
 import pandas as pd
 from google.oauth2.service_account import Credentials
+from gspread.utils import rowcol_to_a1
 
 DEFAULT_SCOPES = (
     "https://www.googleapis.com/auth/spreadsheets",
@@ -20,6 +22,24 @@ DEFAULT_SCOPES = (
 )
 
 
+def values_to_dataframe(values: List[List[Any]]) -> pd.DataFrame:
+    """Convierte celdas leídas de la API (encabezado + filas) en un DataFrame."""
+
+    if not values:
+        return pd.DataFrame()
+    header = values[0]
+    width = len(header)
+    # La API omite las celdas vacías al final de cada fila; se rellenan para igualar el encabezado.
+    rows = [row[:width] + [""] * (width - len(row)) for row in values[1:]]
+    return pd.DataFrame(rows, columns=header)
+
+
+def column_letter(column_number: int) -> str:
+    """Devuelve la letra A1 de una columna numerada desde 1 (1 -> ``A``, 27 -> ``AA``)."""
+
+    return rowcol_to_a1(1, column_number)[:-1]
+
+
 class SheetsManager:
     """Encapsula operaciones de lectura y escritura sobre una hoja de calculo."""
 
@@ -69,20 +89,56 @@ class SheetsManager:
 
         worksheet = self._spreadsheet.worksheet(worksheet_title)
         values = worksheet.get_all_values()
-        if not values:
-            return pd.DataFrame()
-        header = values[0]
-        rows = values[1:]
-        return pd.DataFrame(rows, columns=header)
+        return values_to_dataframe(values)
+
+    def read_worksheets(self, worksheet_titles: Sequence[str]) -> Dict[str, pd.DataFrame]:
+        """Lee varias pestañas en una sola llamada ``values:batchGet`` y las devuelve por título."""
+
+        titles = list(worksheet_titles)
+        blocks = self.read_ranges([f"'{title}'" for title in titles])
+        return {title: values_to_dataframe(values) for title, values in zip(titles, blocks)}
+
+    def read_ranges(self, a1_ranges: Sequence[str]) -> List[List[List[Any]]]:
+        """Lee varios rangos A1 en una sola llamada ``values:batchGet``, en el mismo orden."""
+
+        ranges = list(a1_ranges)
+        if not ranges:
+            return []
+        response = self._spreadsheet.values_batch_get(ranges=ranges)
+        value_ranges = response.get("valueRanges", [])
+        return [
+            value_ranges[index].get("values", []) if index < len(value_ranges) else []
+            for index in range(len(ranges))
+        ]
 
     def write_dataframe(self, worksheet_title: str, dataframe: pd.DataFrame, replace: bool = True) -> None:
         """Escribe un DataFrame en la pestaña objetivo; crea la pestaña si no existe."""
 
         worksheet = self._get_or_create_worksheet(worksheet_title, dataframe)
-        if replace:
-            worksheet.clear()
         payload = self._dataframe_to_rows(dataframe)
-        worksheet.update("A1", payload, value_input_option="USER_ENTERED")
+        if replace:
+            # Sólo se limpia la zona que el nuevo contenido no sobrescribe; la escritura mantiene
+            # el tamaño del DataFrame en lugar del de la cuadrícula completa.
+            stale_ranges = self._stale_ranges(
+                worksheet_title, len(payload), len(payload[0]), worksheet.row_count, worksheet.col_count
+            )
+            if stale_ranges:
+                self._spreadsheet.values_batch_clear(body={"ranges": stale_ranges})
+        self._spreadsheet.values_batch_update(
+            body={
+                "valueInputOption": "USER_ENTERED",
+                "data": [{"range": f"'{worksheet_title}'!A1", "values": payload}],
+            }
+        )
+
+    def append_dataframe(self, worksheet_title: str, dataframe: pd.DataFrame) -> None:
+        """Agrega las filas del DataFrame al final de la pestaña sin reescribir el contenido previo."""
+
+        if dataframe.empty:
+            return
+        worksheet = self._get_or_create_worksheet(worksheet_title, dataframe)
+        rows = self._dataframe_to_rows(dataframe)[1:]
+        worksheet.append_rows(rows, value_input_option="USER_ENTERED")
 
     def _get_or_create_worksheet(self, worksheet_title: str, dataframe: pd.DataFrame) -> gspread.Worksheet:
         try:
@@ -91,10 +147,25 @@ class SheetsManager:
             rows, cols = max(len(dataframe.index) + 1, 1), max(len(dataframe.columns), 1)
             return self._spreadsheet.add_worksheet(title=worksheet_title, rows=str(rows), cols=str(cols))
 
+    @staticmethod
+    def _stale_ranges(worksheet_title: str, rows: int, cols: int, grid_rows: int, grid_cols: int) -> List[str]:
+        """Rangos A1 de la cuadrícula que quedan fuera de un bloque ``rows`` x ``cols`` desde A1."""
+
+        ranges = []
+        if grid_cols > cols and rows:
+            start, end = rowcol_to_a1(1, cols + 1), rowcol_to_a1(rows, grid_cols)
+            ranges.append(f"'{worksheet_title}'!{start}:{end}")
+        if grid_rows > rows:
+            ranges.append(f"'{worksheet_title}'!{rows + 1}:{grid_rows}")
+        return ranges
+
     @staticmethod
     def _dataframe_to_rows(dataframe: pd.DataFrame) -> List[List[Any]]:
         if dataframe.empty:
             return [dataframe.columns.tolist()]
-        safe_df = dataframe.copy()
-        safe_df = safe_df.fillna("")
-        return [safe_df.columns.tolist()] + safe_df.astype(str).values.tolist()
+        # Cada columna se convierte a texto por separado (celdas nulas como ""); luego se trasponen a filas.
+        columns = [
+            np.where(pd.isna(dataframe[column].to_numpy()), "", dataframe[column].astype(str).to_numpy())
+            for column in dataframe.columns
+        ]
+        return [dataframe.columns.tolist()] + [list(row) for row in zip(*columns)]
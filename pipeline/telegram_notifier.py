@@ -2,25 +2,36 @@
 
 from __future__ import annotations
 
+import http.client
 import json
 import os
 import sys
-import urllib.error
-import urllib.request
 from typing import Optional
 
+TAIL_LINES = 40
+TAIL_BYTES = 16384
+TELEGRAM_HOST = "api.telegram.org"
+
+# Conexión keep-alive reutilizada entre mensajes para no repetir el handshake TLS en cada envío.
+_connection: Optional[http.client.HTTPSConnection] = None
+
 
 def _read_tail(summary_path: Optional[str], fallback: str) -> str:
     if not summary_path or not os.path.isfile(summary_path):
         return fallback
     try:
-        with open(summary_path, "r", encoding="utf-8", errors="replace") as handle:
-            lines = handle.readlines()
+        # Se leen sólo los últimos TAIL_BYTES del archivo, como ``tail``.
+        with open(summary_path, "rb") as handle:
+            handle.seek(0, os.SEEK_END)
+            start = max(0, handle.tell() - TAIL_BYTES)
+            handle.seek(start)
+            tail_bytes = handle.read()
     except OSError:
         return fallback
-    if not lines:
-        return fallback
-    tail = "".join(lines[-40:]).strip()
+    lines = tail_bytes.decode("utf-8", errors="replace").splitlines()
+    if start > 0 and lines:
+        lines = lines[1:]  # la primera línea puede estar cortada
+    tail = "\n".join(lines[-TAIL_LINES:]).strip()
     return tail or fallback
 
 
@@ -44,15 +55,45 @@ def build_message(status: str, executed_at: str, variation_count: str, tail: Opt
     return "\n".join(parts)
 
 
+def _get_connection() -> http.client.HTTPSConnection:
+    global _connection
+    if _connection is None:
+        _connection = http.client.HTTPSConnection(TELEGRAM_HOST, timeout=10)
+    return _connection
+
+
+def _close_connection() -> None:
+    global _connection
+    if _connection is not None:
+        _connection.close()
+        _connection = None
+
+
 def send_telegram_message(token: str, chat_id: str, text: str) -> None:
     payload = json.dumps({"chat_id": chat_id, "text": text[:4000]}).encode()
-    request = urllib.request.Request(
-        f"https://api.telegram.org/bot{token}/sendMessage",
-        data=payload,
-        headers={"Content-Type": "application/json"},
-    )
-    with urllib.request.urlopen(request) as response:
-        print(f"Telegram respondio con estado {response.status}", file=sys.stdout)
+    headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+    while True:
+        reused = _connection is not None
+        connection = _get_connection()
+        try:
+            connection.request("POST", f"/bot{token}/sendMessage", body=payload, headers=headers)
+            response = connection.getresponse()
+            body = response.read()
+            break
+        except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+            # Una conexión keep-alive que el servidor ya cerró falla al enviar o sin devolver ni una
+            # línea de respuesta: el mensaje no llegó y se reintenta una vez con conexión nueva.
+            _close_connection()
+            if not reused:
+                raise
+        except (http.client.HTTPException, OSError):
+            # Cualquier otro fallo (p. ej. leyendo la respuesta) no se reintenta para no duplicar
+            # un mensaje que Telegram pudo haber aceptado.
+            _close_connection()
+            raise
+    if response.status >= 400:
+        raise http.client.HTTPException(f"HTTP {response.status}: {body.decode(errors='replace')}")
+    print(f"Telegram respondio con estado {response.status}", file=sys.stdout)
 
 
 def main() -> None:
@@ -74,7 +115,7 @@ def main() -> None:
 
     try:
         send_telegram_message(token, chat_id, message)
-    except urllib.error.URLError as exc:
+    except (http.client.HTTPException, OSError) as exc:
         raise RuntimeError(f"Error enviando mensaje de Telegram: {exc}") from exc
 
 
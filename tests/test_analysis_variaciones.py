@@ -0,0 +1,92 @@
+import os
+import sys
+
+import pandas as pd
+from gspread.utils import a1_range_to_grid_range
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "pipeline"))
+
+import analysis_variaciones  # noqa: E402
+from analysis_variaciones import parse_dates  # noqa: E402
+
+
+def test_parse_dates_iso():
+    parsed = parse_dates(pd.Series(["2025-01-15", "", None, "no es fecha"]))
+    assert parsed.iloc[0] == pd.Timestamp("2025-01-15")
+    assert parsed.iloc[1:].isna().all()
+
+
+def test_parse_dates_day_first_column_keeps_a_single_format():
+    parsed = parse_dates(pd.Series(["15/01/2025", "02/03/2025", "05/04/2025"]))
+    assert parsed.tolist() == [
+        pd.Timestamp("2025-01-15"),
+        pd.Timestamp("2025-03-02"),
+        pd.Timestamp("2025-04-05"),
+    ]
+
+
+def test_parse_dates_ambiguous_first_value_uses_the_whole_column():
+    parsed = parse_dates(pd.Series(["04/02/2025", "13/02/2025", "03/03/2025"]))
+    assert parsed.tolist() == [
+        pd.Timestamp("2025-02-04"),
+        pd.Timestamp("2025-02-13"),
+        pd.Timestamp("2025-03-03"),
+    ]
+
+
+def test_parse_dates_month_first_column():
+    parsed = parse_dates(pd.Series(["04/02/2025", "04/13/2025", ""]))
+    assert parsed.iloc[:2].tolist() == [pd.Timestamp("2025-04-02"), pd.Timestamp("2025-04-13")]
+    assert pd.isna(parsed.iloc[2])
+
+
+class GridManager:
+    """Implementa ``SheetsIO`` sobre celdas en memoria, sirviendo rangos A1 como la API."""
+
+    def __init__(self, grids):
+        self.grids = grids
+
+    def read_worksheets(self, worksheet_titles):
+        blocks = self.read_ranges([f"'{title}'" for title in worksheet_titles])
+        return {
+            title: pd.DataFrame(block[1:], columns=block[0])
+            for title, block in zip(worksheet_titles, blocks)
+        }
+
+    def read_ranges(self, a1_ranges):
+        blocks = []
+        for a1_range in a1_ranges:
+            title, _, cells = a1_range.partition("!")
+            grid = self.grids[title.strip("'")]
+            if not cells:
+                blocks.append(grid)
+                continue
+            bounds = a1_range_to_grid_range(cells)
+            rows = grid[bounds.get("startRowIndex", 0) : bounds.get("endRowIndex", len(grid))]
+            start_col = bounds.get("startColumnIndex", 0)
+            blocks.append([row[start_col : bounds.get("endColumnIndex", len(row))] for row in rows])
+        return blocks
+
+    def write_dataframe(self, worksheet_title, dataframe, replace=True):
+        raise AssertionError("write_output=False no debe escribir")
+
+
+def day_first_grids():
+    dates = pd.date_range("2025-01-13", "2025-03-03").strftime("%d/%m/%Y")
+    urls = ["https://example.com/a", "https://example.com/b"]
+    gsc = [["date", "page", "clicks", "impressions", "ctr", "position"]]
+    ga4 = [["date", "page", "sessions", "avg_session_duration", "bounce_rate"]]
+    for day, date in enumerate(dates):
+        for index, url in enumerate(urls):
+            value = day * (index + 1) + 1
+            gsc.append([date, url, str(value), str(value * 10), "0.05", str(10 - index)])
+            ga4.append([date, url, str(value), "60", "0.5"])
+    return {analysis_variaciones.GSC_WORKSHEET: gsc, analysis_variaciones.GA4_WORKSHEET: ga4}
+
+
+def test_lookback_read_matches_full_history_read():
+    manager = GridManager(day_first_grids())
+    recent = analysis_variaciones.run_pipeline(manager=manager, write_output=False)
+    full = analysis_variaciones.run_pipeline(manager=manager, write_output=False, full_history=True)
+    assert recent["Periodo Analizado"].iloc[0].startswith("2025-02-18 a 2025-03-03")
+    pd.testing.assert_frame_equal(recent, full)